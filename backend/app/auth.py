@@ -1,7 +1,15 @@
+import logging
+
 from fastapi import HTTPException
-from .supabase_client import supabase
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from jose import jwt, JWTError
+from .supabase_client import SupabaseError, get_supabase_client
+from .jwt_verifier import get_token_verifier, user_from_claims
+from .session_store import get_session_manager
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
 
 
 class LoginCredentials(BaseModel):
@@ -9,9 +17,82 @@ class LoginCredentials(BaseModel):
     password: str
 
 
+class UserIdentity(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    user_id: str
+    identity_data: Dict[str, Any] = {}
+    provider: str
+    created_at: Optional[datetime] = None
+    last_sign_in_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class Factor(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    friendly_name: Optional[str] = None
+    factor_type: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class User(BaseModel):
+    """
+    The GoTrue user, with the same fields as supabase-py's gotrue User.
+    Fields that newer GoTrue versions add are passed through, not dropped.
+
+    When the access token is verified locally, only the fields carried in
+    its claims are filled in. ?revalidate=true returns the full record from
+    Supabase.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    app_metadata: Dict[str, Any] = {}
+    user_metadata: Dict[str, Any] = {}
+    aud: Optional[str] = None
+    confirmation_sent_at: Optional[datetime] = None
+    recovery_sent_at: Optional[datetime] = None
+    email_change_sent_at: Optional[datetime] = None
+    new_email: Optional[str] = None
+    invited_at: Optional[datetime] = None
+    action_link: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    created_at: Optional[datetime] = None
+    confirmed_at: Optional[datetime] = None
+    email_confirmed_at: Optional[datetime] = None
+    phone_confirmed_at: Optional[datetime] = None
+    last_sign_in_at: Optional[datetime] = None
+    role: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    identities: Optional[List[UserIdentity]] = None
+    factors: Optional[List[Factor]] = None
+    is_anonymous: Optional[bool] = None
+
+
+class Session(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+    expires_at: Optional[int] = None
+    user: User
+
+
 class AuthResponse(BaseModel):
-    user: dict
-    session: Optional[dict] = None
+    user: User
+    session: Optional[Session] = None
+    message: str
+
+
+class LoginResponse(BaseModel):
+    user: User
     message: str
 
 
@@ -25,47 +106,109 @@ class AuthService:
                     status_code=400, detail="Email and password required"
                 )
 
-            auth_response = supabase.auth.sign_in_with_password(
-                {"email": credentials.email, "password": credentials.password}
+            session = await get_supabase_client().sign_in_with_password(
+                credentials.email, credentials.password
             )
 
-            if not auth_response.user:
+            if not session.get("user"):
                 raise HTTPException(status_code=401, detail="Invalid credentials")
 
+            await get_session_manager().save(session)
+
             return AuthResponse(
-                user=auth_response.user,
-                session=auth_response.session,
+                user=User.model_validate(session["user"]),
+                session=Session.model_validate(session),
                 message="Login successful",
             )
         except Exception as e:
             # Log the error here (but don't expose internal details)
-            print(f"Login error: {str(e)}")  # Replace with proper logging
+            logger.warning("Login failed: %s", e)
             raise HTTPException(
                 status_code=401,
                 detail="Authentication failed. Please check your credentials.",
             )
 
     @staticmethod
-    async def signout() -> dict:
+    async def signout(access_token: Optional[str] = None) -> dict:
         try:
+            if access_token:
+                await AuthService._revoke(access_token)
+                await get_session_manager().remove(access_token)
+
             # Verify current session before signing out
-            current_user = supabase.auth.get_user()
-            if not current_user:
+            if not access_token:
                 raise HTTPException(status_code=401, detail="No active session")
 
-            supabase.auth.sign_out()
+            await get_supabase_client().sign_out(access_token)
             return {"message": "Signed out successfully"}
         except Exception as e:
-            print(f"Signout error: {str(e)}")  # Replace with proper logging
+            logger.warning("Sign out failed: %s", e)
             raise HTTPException(status_code=400, detail="Sign out failed")
 
     @staticmethod
-    async def get_current_user() -> Optional[dict]:
+    async def _revoke(access_token: str) -> None:
+        # Only genuine tokens go on the denylist, so forged ones cannot
+        # crowd out real entries
+        verifier = get_token_verifier()
+        try:
+            claims = await verifier.verify(access_token)
+        except JWTError:
+            claims = None
+        if claims is not None:
+            verifier.revoke(access_token, claims["exp"])
+        else:
+            verifier.invalidate(access_token)
+
+    @staticmethod
+    async def refresh_session(access_token: Optional[str] = None) -> Optional[dict]:
+        """
+        Return a replacement session when the stored session for this token is
+        about to expire (or was already refreshed by a concurrent request).
+        """
+        if not access_token:
+            return None
+        sessions = get_session_manager()
+        try:
+            return await sessions.ensure_fresh(access_token)
+        except SupabaseError as e:
+            # A 4xx means the refresh token was rejected: drop the session.
+            # Anything else (timeouts, 5xx, 429) is transient: keep it so the
+            # next request retries. Either way the access token itself still
+            # decides this request.
+            status = e.status_code or 0
+            if 400 <= status < 500 and status not in (408, 429):
+                await sessions.remove(access_token)
+            logger.warning("Session refresh failed: %s", e)
+            return None
+        except Exception as e:
+            logger.warning("Session refresh failed: %s", e)
+            return None
+
+    @staticmethod
+    async def get_current_user(
+        access_token: Optional[str] = None, force_revalidate: bool = False
+    ) -> Optional[User]:
+        if not access_token:
+            return None
+
+        verifier = get_token_verifier()
+        if not force_revalidate:
+            # Fast path: verify the token signature locally (or hit the claims
+            # cache) without a round trip to GoTrue.
+            try:
+                claims = await verifier.verify(access_token)
+            except JWTError:
+                raise HTTPException(status_code=401, detail="Invalid or expired token")
+            if claims is not None:
+                return User.model_validate(user_from_claims(claims))
+
+        # Token can't be verified locally, or the caller asked for a revocation
+        # check: ask Supabase, then cache the claims until the token expires.
         try:
-            user = supabase.auth.get_user()
-            if not user:
-                return None
-            return user.user
+            user = await get_supabase_client().get_user(access_token)
+            verifier.remember(access_token, jwt.get_unverified_claims(access_token))
+            return User.model_validate(user)
         except Exception as e:
-            print(f"Get user error: {str(e)}")  # Replace with proper logging
+            verifier.invalidate(access_token)
+            logger.warning("Get user failed: %s", e)
             raise HTTPException(status_code=401, detail="Failed to get user info")
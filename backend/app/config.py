@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -8,6 +9,52 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_anon_key: str
     supabase_service_role_key: str
+    # Project JWT secret; enables local verification of HS256 access tokens.
+    # Asymmetric (RS256/ES256) tokens are verified against the project JWKS.
+    supabase_jwt_secret: Optional[str] = None
+    jwt_audience: str = "authenticated"
+    jwt_cache_size: int = 1024
+    jwt_denylist_size: int = 10000
+    # Shared HTTP transport for Supabase calls
+    supabase_max_connections: int = 100
+    supabase_max_keepalive_connections: int = 20
+    supabase_keepalive_expiry: float = 30.0
+    supabase_timeout: float = 10.0
+    supabase_connect_timeout: float = 3.0
+    supabase_max_concurrency: int = 50
+    # Server-side session store
+    session_store_max_entries: int = 10000
+    session_ttl: float = 7 * 24 * 3600
+    # Refresh once less than this fraction of the token's lifetime (or the
+    # margin, in seconds, if longer) remains
+    session_refresh_fraction: float = 0.5
+    session_refresh_margin: float = 60.0
+    session_refresh_grace: float = 30.0
+    # Login rate limits (token buckets: rate in tokens/s, burst in tokens)
+    login_ip_rate: float = 0.5
+    login_ip_burst: float = 20
+    login_email_rate: float = 5 / 60
+    login_email_burst: float = 5
+    rate_limit_max_keys: int = 100000
+    trust_forwarded_for: bool = False
+    # Proxies in front of the app that append to X-Forwarded-For; the client
+    # address is the entry this many places from the right
+    forwarded_for_hops: int = 1
+    # Load shedding for upstream login calls
+    login_max_concurrency: int = 32
+    login_latency_target: float = 1.0
+    # Logging: bounded queue drained off the event loop, per-message rate limit
+    log_level: str = "INFO"
+    log_queue_size: int = 10000
+    log_rate_limit: int = 10
+    log_rate_window: float = 1.0
+    # Directory shared by a worker pool's metrics snapshots (set by the launcher)
+    metrics_dir: Optional[str] = None
+    metrics_flush_interval: float = 5.0
+    # Readiness checks: per-check timeout, result cache TTL, background refresh
+    health_check_timeout: float = 2.0
+    health_cache_ttl: float = 10.0
+    health_refresh_interval: float = 5.0
 
     class Config:
         env_file = ".env"
@@ -1,8 +1,7 @@
-from functools import lru_cache
-from supabase import create_client, Client
-from .config import get_settings
+from .supabase_client import AsyncSupabase, get_supabase_client
 
-@lru_cache()
-def get_supabase() -> Client:
-    settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_key) 
\ No newline at end of file
+
+def get_supabase() -> AsyncSupabase:
+    # The client caches itself and is recreated after the lifespan closes it,
+    # so this must not be lru_cached.
+    return get_supabase_client()
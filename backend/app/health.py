@@ -1,64 +1,164 @@
+import asyncio
+import time
 from fastapi import APIRouter, Depends, HTTPException
-from supabase import Client
-from typing import Dict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional
 from datetime import datetime
-from ..core.config import get_settings
-from .auth import get_supabase
-
-router = APIRouter(tags=["health"])
-
-async def check_supabase_auth(supabase: Client) -> Dict:
-    try:
-        # Try to get anon JWT - if this works, auth is configured
-        jwt = await supabase.auth.get_session()
-        return {
-            "auth_status": "healthy",
-            "message": "Supabase auth connection verified"
-        }
-    except Exception as e:
-        return {
-            "auth_status": "unhealthy",
-            "error": str(e)
-        }
+from .config import get_settings
+from .dependencies import get_supabase
+from .supabase_client import AsyncSupabase
 
-async def check_supabase_db(supabase: Client) -> Dict:
-    try:
-        # Simple query to verify database connection
-        result = await supabase.table('health_checks').select("*").limit(1).execute()
-        return {
-            "db_status": "healthy",
-            "message": "Database connection verified"
-        }
-    except Exception as e:
-        return {
-            "db_status": "unhealthy",
-            "error": str(e)
+router = APIRouter(prefix="/api/health", tags=["health"])
+
+HealthCheckFn = Callable[[], Awaitable[Optional[Dict]]]
+
+
+async def check_supabase_auth(supabase: AsyncSupabase) -> Dict:
+    # GoTrue's health endpoint answers with the anon key if auth is configured
+    await supabase.auth_health()
+    return {"message": "Supabase auth connection verified"}
+
+
+async def check_supabase_db(supabase: AsyncSupabase) -> Dict:
+    # Simple query to verify database connection
+    await supabase.select("health_checks", limit=1)
+    return {"message": "Database connection verified"}
+
+
+class HealthMonitor:
+    """
+    Runs registered dependency checks concurrently, each under its own
+    timeout, and caches the combined result for `ttl` seconds.
+
+    A check is an async callable that returns optional details and raises
+    when the dependency is unhealthy. `start()` launches a background task
+    that refreshes the cache every `refresh_interval` seconds so probes can
+    be answered from memory; without it, stale results are refreshed on
+    demand, with concurrent callers sharing one refresh.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 10.0,
+        refresh_interval: float = 5.0,
+        default_timeout: float = 2.0,
+    ):
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.default_timeout = default_timeout
+        self._checks: Dict[str, tuple] = {}
+        self._results: Optional[Dict] = None
+        self._checked_at = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def register(
+        self, name: str, check: HealthCheckFn, timeout: Optional[float] = None
+    ) -> None:
+        self._checks[name] = (check, timeout or self.default_timeout)
+        self._checked_at = 0.0
+
+    def unregister(self, name: str) -> None:
+        self._checks.pop(name, None)
+        self._checked_at = 0.0
+
+    async def _run_check(self, check: HealthCheckFn, timeout: float) -> Dict:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), timeout)
+            result = {"status": "healthy", **(details or {})}
+        except asyncio.TimeoutError:
+            result = {"status": "unhealthy", "error": f"Timed out after {timeout}s"}
+        except Exception as e:
+            result = {"status": "unhealthy", "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    async def refresh(self) -> Dict:
+        names = list(self._checks)
+        results = await asyncio.gather(
+            *(self._run_check(*self._checks[name]) for name in names)
+        )
+        self._results = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "checks": dict(zip(names, results)),
         }
+        self._checked_at = time.monotonic()
+        return self._results
+
+    async def _refresh_once(self) -> Dict:
+        # Single flight: the background loop and probes on a stale (or still
+        # empty) cache all await the same refresh
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self.refresh())
+        return await asyncio.shield(self._refreshing)
+
+    async def get_results(self) -> Dict:
+        if self._results is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._results
+        return await self._refresh_once()
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            await self._refresh_once()
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._refresh_forever())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refreshing):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._refreshing = None
+
 
-@router.get("/health")
-async def health_check(supabase: Client = Depends(get_supabase)) -> Dict:
+@lru_cache()
+def get_health_monitor() -> HealthMonitor:
+    settings = get_settings()
+    monitor = HealthMonitor(
+        ttl=settings.health_cache_ttl,
+        refresh_interval=settings.health_refresh_interval,
+        default_timeout=settings.health_check_timeout,
+    )
+    # Resolve the client per run so checks survive a client restart
+    monitor.register("supabase_auth", lambda: check_supabase_auth(get_supabase()))
+    monitor.register("supabase_db", lambda: check_supabase_db(get_supabase()))
+    return monitor
+
+
+@router.get("")
+async def liveness() -> Dict:
+    """Cheap liveness probe: the process is up and serving requests."""
+    return {"status": "healthy"}
+
+
+@router.get("/ready")
+async def readiness(monitor: HealthMonitor = Depends(get_health_monitor)) -> Dict:
     """
-    Comprehensive health check endpoint that verifies:
+    Readiness probe that reports every registered dependency check:
     1. Backend server status
     2. Supabase authentication service
     3. Supabase database connection
-    4. Environment configuration
+    4. Any checks registered through get_health_monitor().register()
+
+    Answered from the monitor's cache; returns 503 if any check is unhealthy.
     """
-    timestamp = datetime.utcnow().isoformat()
     settings = get_settings()
+    results = await monitor.get_results()
 
-    # Check Supabase services
-    auth_status = await check_supabase_auth(supabase)
-    db_status = await check_supabase_db(supabase)
-
-    # Determine overall health
-    is_healthy = (
-        auth_status.get("auth_status") == "healthy" and 
-        db_status.get("db_status") == "healthy"
+    is_healthy = all(
+        check["status"] == "healthy" for check in results["checks"].values()
     )
 
     response = {
-        "timestamp": timestamp,
+        "timestamp": results["timestamp"],
         "status": "healthy" if is_healthy else "unhealthy",
         "environment": settings.environment,
         "services": {
@@ -66,10 +166,7 @@ async def health_check(supabase: Client = Depends(get_supabase)) -> Dict:
                 "status": "healthy",
                 "version": "1.0.0"  # You can make this dynamic
             },
-            "supabase": {
-                "auth": auth_status,
-                "database": db_status
-            }
+            **results["checks"],
         }
     }
 
@@ -79,4 +176,4 @@ async def health_check(supabase: Client = Depends(get_supabase)) -> Dict:
             detail=response
         )
 
-    return response 
\ No newline at end of file
+    return response
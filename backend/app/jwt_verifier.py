@@ -0,0 +1,181 @@
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional
+
+from jose import jwt, JWTError
+
+from .config import get_settings
+from .supabase_client import SupabaseError, get_supabase_client
+
+# Algorithms Supabase signs access tokens with: HS256 for the legacy shared
+# secret, RS256/ES256 for asymmetric signing keys published via JWKS.
+SYMMETRIC_ALGORITHMS = {"HS256"}
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+# The anon and service_role API keys are JWTs signed with the same secret;
+# only tokens issued to a signed-in user may stand in for a session.
+USER_ROLES = {"authenticated"}
+
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens locally and keeps a bounded LRU cache of
+    verified claims, keyed by token, until each token expires.
+
+    `verify` returns None when the token cannot be checked locally (no secret
+    configured, unknown signing key) so the caller can fall back to Supabase.
+    Invalid or expired tokens, and tokens without `sub`, `aud` and a user
+    role (such as the anon and service_role keys), raise JWTError.
+
+    Signed-out tokens are kept on a denylist (at most `max_revoked`, oldest
+    dropped first) until they expire, so their still-valid signature is not
+    accepted again.
+    """
+
+    def __init__(
+        self,
+        jwt_secret: Optional[str] = None,
+        fetch_jwks: Optional[Callable[[], Awaitable[Dict]]] = None,
+        audience: Optional[str] = "authenticated",
+        max_entries: int = 1024,
+        jwks_refresh_interval: float = 300.0,
+        max_revoked: int = 10000,
+    ):
+        self.jwt_secret = jwt_secret
+        self.fetch_jwks = fetch_jwks
+        self.audience = audience
+        self.max_entries = max_entries
+        self.jwks_refresh_interval = jwks_refresh_interval
+        self.max_revoked = max_revoked
+        self._claims: "OrderedDict[str, Dict]" = OrderedDict()
+        # token -> exp
+        self._revoked: "OrderedDict[str, float]" = OrderedDict()
+        self._jwks: Dict[str, Dict] = {}
+        self._jwks_fetched_at = 0.0
+
+    def get_cached(self, token: str) -> Optional[Dict]:
+        entry = self._claims.get(token)
+        if entry is None:
+            return None
+        if entry.get("exp", 0) <= time.time():
+            del self._claims[token]
+            return None
+        self._claims.move_to_end(token)
+        return entry
+
+    def remember(self, token: str, claims: Dict) -> None:
+        """Cache claims for a token that has been verified (locally or upstream)."""
+        if claims.get("exp", 0) <= time.time() or self.is_revoked(token):
+            return
+        self._claims[token] = claims
+        self._claims.move_to_end(token)
+        while len(self._claims) > self.max_entries:
+            self._claims.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        self._claims.pop(token, None)
+
+    def revoke(self, token: str, exp: float) -> None:
+        """Refuse `token` from now until `exp`."""
+        self.invalidate(token)
+        now = time.time()
+        if exp <= now:
+            return
+        self._revoked[token] = exp
+        if len(self._revoked) > self.max_revoked:
+            for revoked, revoked_exp in list(self._revoked.items()):
+                if revoked_exp <= now:
+                    del self._revoked[revoked]
+            while len(self._revoked) > self.max_revoked:
+                self._revoked.popitem(last=False)
+
+    def is_revoked(self, token: str) -> bool:
+        exp = self._revoked.get(token)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            del self._revoked[token]
+            return False
+        return True
+
+    async def verify(self, token: str) -> Optional[Dict]:
+        if self.is_revoked(token):
+            raise JWTError("Token has been signed out")
+        cached = self.get_cached(token)
+        if cached is not None:
+            return cached
+
+        header = jwt.get_unverified_header(token)
+        key = await self._resolve_key(header)
+        if key is None:
+            return None
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[header.get("alg")],
+            audience=self.audience,
+            options={
+                "verify_aud": self.audience is not None,
+                "require_aud": self.audience is not None,
+                "require_sub": True,
+                "require_exp": True,
+            },
+        )
+        if claims.get("role") not in USER_ROLES:
+            raise JWTError("Token is not a user access token")
+        self.remember(token, claims)
+        return claims
+
+    async def _resolve_key(self, header: Dict):
+        alg = header.get("alg")
+        if alg in SYMMETRIC_ALGORITHMS:
+            return self.jwt_secret
+        if alg not in ASYMMETRIC_ALGORITHMS or self.fetch_jwks is None:
+            return None
+
+        kid = header.get("kid")
+        if kid not in self._jwks:
+            await self._refresh_jwks()
+        return self._jwks.get(kid)
+
+    async def _refresh_jwks(self) -> None:
+        # Unknown kids are refetched at most once per interval, so a flood of
+        # forged tokens cannot turn into a flood of JWKS requests.
+        now = time.monotonic()
+        if self._jwks_fetched_at and now - self._jwks_fetched_at < self.jwks_refresh_interval:
+            return
+        self._jwks_fetched_at = now
+        try:
+            jwks = await self.fetch_jwks()
+        except SupabaseError:
+            return
+        self._jwks = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+
+
+def user_from_claims(claims: Dict) -> Dict:
+    """Build the user payload returned by /api/auth/user from verified claims."""
+    return {
+        "id": claims.get("sub"),
+        "aud": claims.get("aud"),
+        "role": claims.get("role"),
+        "email": claims.get("email"),
+        "phone": claims.get("phone"),
+        "app_metadata": claims.get("app_metadata", {}),
+        "user_metadata": claims.get("user_metadata", {}),
+        "is_anonymous": claims.get("is_anonymous"),
+    }
+
+
+@lru_cache()
+def get_token_verifier() -> TokenVerifier:
+    settings = get_settings()
+    return TokenVerifier(
+        jwt_secret=settings.supabase_jwt_secret,
+        # Resolve the client per call so JWKS fetches share the pooled transport
+        fetch_jwks=lambda: get_supabase_client().get_jwks(),
+        audience=settings.jwt_audience,
+        max_entries=settings.jwt_cache_size,
+        max_revoked=settings.jwt_denylist_size,
+    )
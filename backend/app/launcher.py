@@ -0,0 +1,159 @@
+"""
+Production entry point: a pre-forking gunicorn master running uvicorn workers.
+
+The app is imported once in the master (`preload_app`) and workers are
+forked from it, so they share the imported code pages. Importing
+app.main builds no per-process state: settings, the Supabase client,
+caches and the log listener thread are all created on first use, which
+happens in each worker's lifespan or first request, never in the master.
+Nothing therefore needs resetting after fork; tests/test_launcher.py
+checks that this stays true.
+
+Metrics are aggregated across workers at scrape time: the launcher points
+METRICS_DIR at a directory shared by the pool (a fresh temporary one
+unless the variable is already set, in which case files from a previous
+run are cleared). Each worker records in memory and writes a snapshot
+there every METRICS_FLUSH_INTERVAL seconds, and `/metrics` on any worker
+merges all snapshots. When a worker exits, the master folds its snapshot
+into the retired totals, so counts of recycled workers are kept.
+
+Login rate limits, the load shedder, the server-side session store, the
+token cache and the signed-out token denylist are still per worker:
+
+- each worker enforces the LOGIN_* limits on its own, so a client can
+  make up to `--workers` times as many attempts; divide the limits by the
+  worker count (or enforce them at the proxy) to keep the intended total;
+- a session can only be refreshed by the worker that handled the login
+  (or the last refresh). Requests reaching other workers are still
+  authenticated from the token itself, but if none of the requests made in
+  the second half of the token's lifetime (SESSION_REFRESH_FRACTION) lands
+  on the owning worker, the user has to sign in again. Use sticky sessions, one worker
+  per container, or a shared SessionStore when this matters;
+- signout revokes the access token only on the worker that handled it;
+  other workers accept it until it expires (or until ?revalidate=true
+  checks it with Supabase).
+
+SIGTERM drains in-flight requests for up to `--graceful-timeout` seconds
+before workers exit. Workers are recycled after `--max-requests` requests
+(plus jitter, so they do not all restart together).
+
+Options default to environment variables so the same command works
+locally and in containers:
+
+    start --workers 4 --bind 0.0.0.0:8000
+    WEB_CONCURRENCY=4 PORT=8000 python -m app.launcher
+"""
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional
+
+from gunicorn.app.base import BaseApplication
+
+
+def default_workers() -> int:
+    """One worker per CPU available to this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class Launcher(BaseApplication):
+    def __init__(self, app_uri: str, options: Dict):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from gunicorn.util import import_app
+
+        return import_app(self.app_uri)
+
+
+def prepare_metrics_dir() -> Optional[str]:
+    """
+    Give the workers a directory for their metrics snapshots. Returns the
+    directory if it was created here (and should be removed on exit).
+    """
+    directory = os.environ.get("METRICS_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            os.remove(path)
+        return None
+    directory = tempfile.mkdtemp(prefix="dhg-metrics-")
+    os.environ["METRICS_DIR"] = directory
+    return directory
+
+
+def worker_exited(server, worker) -> None:
+    from .metrics import retire_worker
+
+    retire_worker(os.environ["METRICS_DIR"], worker.pid)
+
+
+def build_options(
+    args: argparse.Namespace, metrics_dir: Optional[str] = None
+) -> Dict[str, Optional[object]]:
+    options = {
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter,
+        "graceful_timeout": args.graceful_timeout,
+        "timeout": args.timeout,
+        "keepalive": args.keepalive,
+        "loglevel": args.log_level,
+        "child_exit": worker_exited,
+    }
+    if metrics_dir:
+        # on_exit runs in the master only, after every worker has stopped
+        options["on_exit"] = lambda server: shutil.rmtree(metrics_dir, ignore_errors=True)
+    return options
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    env = os.environ
+    parser = argparse.ArgumentParser(description="Run the DHG backend with a worker pool.")
+    parser.add_argument("--app", default="app.main:app")
+    parser.add_argument(
+        "--bind", default=env.get("BIND", f"0.0.0.0:{env.get('PORT', '8000')}")
+    )
+    parser.add_argument(
+        "--workers", type=int, default=int(env.get("WEB_CONCURRENCY", default_workers()))
+    )
+    parser.add_argument(
+        "--max-requests", type=int, default=int(env.get("MAX_REQUESTS", 10000)),
+        help="recycle a worker after this many requests (0 disables)",
+    )
+    parser.add_argument(
+        "--max-requests-jitter", type=int, default=int(env.get("MAX_REQUESTS_JITTER", 1000))
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=int(env.get("GRACEFUL_TIMEOUT", 30)),
+        help="seconds to drain in-flight requests on SIGTERM",
+    )
+    parser.add_argument("--timeout", type=int, default=int(env.get("WORKER_TIMEOUT", 60)))
+    parser.add_argument("--keepalive", type=int, default=int(env.get("KEEPALIVE", 5)))
+    parser.add_argument("--log-level", default=env.get("LOG_LEVEL", "info").lower())
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    metrics_dir = prepare_metrics_dir()
+    Launcher(args.app, build_options(args, metrics_dir)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,100 @@
-from fastapi import FastAPI, Response, APIRouter
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Request, Response, APIRouter, Cookie
 from fastapi.middleware.cors import CORSMiddleware
-from .auth import AuthService, LoginCredentials
+from fastapi.responses import PlainTextResponse
+from .auth import AuthService, LoginCredentials, LoginResponse, User
+from .logging_config import RequestIdMiddleware, configure_logging, shutdown_logging
+from .metrics import MetricsMiddleware, get_metrics_exporter, render_metrics
+from .responses import ModelResponse, conditional
+from .rate_limit import client_ip, get_login_limiter, get_login_shedder
+from .health import router as health_router, get_health_monitor
+from .supabase_client import close_supabase_client, get_supabase_client
 
 # Create auth router
 auth_router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
-@auth_router.post("/login")
-async def login(request: LoginCredentials, response: Response):
-    auth_response = await AuthService.login(request)
+def set_session_cookie(response: Response, access_token: str):
     response.set_cookie(
         key="sb-access-token",
-        value=auth_response.session.access_token,
+        value=access_token,
         httponly=True,
         secure=True,
         samesite="lax",
     )
-    return {"user": auth_response.user, "message": "Login successful"}
+
+
+@auth_router.post("/login", response_model=LoginResponse)
+async def login(request: LoginCredentials, raw_request: Request):
+    # Reject bursts before doing any upstream work
+    get_login_limiter().check(client_ip(raw_request), request.email)
+    async with get_login_shedder().slot():
+        auth_response = await AuthService.login(request)
+    response = ModelResponse(
+        LoginResponse(user=auth_response.user, message="Login successful")
+    )
+    set_session_cookie(response, auth_response.session.access_token)
+    return response
 
 
 @auth_router.post("/signout")
-async def signout(response: Response):
-    result = await AuthService.signout()
+async def signout(
+    response: Response,
+    access_token: Optional[str] = Cookie(None, alias="sb-access-token"),
+):
+    result = await AuthService.signout(access_token)
     response.delete_cookie("sb-access-token")
     return result
 
 
-@auth_router.get("/user")
-async def get_user():
-    return await AuthService.get_current_user()
+@auth_router.get("/user", response_model=Optional[User])
+async def get_user(
+    request: Request,
+    revalidate: bool = False,
+    access_token: Optional[str] = Cookie(None, alias="sb-access-token"),
+):
+    # Swap in a refreshed token before it expires
+    session = await AuthService.refresh_session(access_token)
+    if session is not None:
+        access_token = session["access_token"]
+
+    # ?revalidate=true forces a revocation check against Supabase
+    user = await AuthService.get_current_user(access_token, force_revalidate=revalidate)
+
+    # Unchanged users get a body-less 304; no-cache makes the browser
+    # revalidate with If-None-Match on every check instead of refetching
+    response = conditional(request, ModelResponse(user))
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers.add_vary_header("Cookie")
+    if session is not None:
+        set_session_cookie(response, session["access_token"])
+    return response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Settings and the Supabase client are built here rather than at import,
+    # so importing the app needs no credentials and stays cheap.
+    configure_logging()
+    get_supabase_client()
+    monitor = get_health_monitor()
+    monitor.start()
+    exporter = get_metrics_exporter()
+    if exporter is not None:
+        exporter.start()
+    yield
+    await monitor.stop()
+    if exporter is not None:
+        # Final flush, so this worker's counts outlive it
+        await exporter.stop()
+    # Drain the pooled Supabase connections on shutdown
+    await close_supabase_client()
+    shutdown_logging()
 
 
 # Main app
-app = FastAPI(title="DHG Hub API")
+app = FastAPI(title="DHG Hub API", lifespan=lifespan)
 
 
 # Add root endpoint
@@ -41,6 +103,13 @@ async def root():
     return {"message": "Backend server is running"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -48,12 +117,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers cache preflight results instead of sending OPTIONS before
+    # every call (Chromium caps this at 2 hours)
+    max_age=7200,
 )
+# Added last so they wrap everything, including CORS
+app.add_middleware(RequestIdMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(auth_router)
-
-
-@app.get("/api/health")
-async def health_check():
-    return {"status": "healthy"}
+app.include_router(health_router)
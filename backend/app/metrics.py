@@ -0,0 +1,321 @@
+import asyncio
+import glob
+import json
+import os
+import time
+import uuid
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_settings
+
+# Prometheus' default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-on-export latency histogram with fixed bucket bounds."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        # One slot per bound plus the +Inf overflow slot
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def add(self, counts: List[int], total: float, count: int) -> None:
+        for i, value in enumerate(counts):
+            self.counts[i] += value
+        self.sum += total
+        self.count += count
+
+
+class Metrics:
+    """
+    In-process metrics registry rendered in the Prometheus text format.
+
+    Labels are plain tuples used as dict keys; route labels are path
+    templates (e.g. /api/auth/user), never raw URLs, so cardinality stays
+    bounded by the routes and upstream operations the code defines.
+
+    Recording only touches these dicts. Workers of a pre-forked pool share
+    their totals through `snapshot`/`merge` (see MetricsExporter), off the
+    request path.
+    """
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.request_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.upstream_latency: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.request_latency.get((method, route))
+        if histogram is None:
+            histogram = self.request_latency[(method, route)] = Histogram()
+        histogram.observe(seconds)
+
+    def observe_upstream(self, operation: str, outcome: str, seconds: float) -> None:
+        histogram = self.upstream_latency.get((operation, outcome))
+        if histogram is None:
+            histogram = self.upstream_latency[(operation, outcome)] = Histogram()
+        histogram.observe(seconds)
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of the current totals."""
+        return {
+            "requests": [[*key, value] for key, value in self.requests.items()],
+            "request_latency": [
+                [*key, h.counts, h.sum, h.count] for key, h in self.request_latency.items()
+            ],
+            "upstream_latency": [
+                [*key, h.counts, h.sum, h.count] for key, h in self.upstream_latency.items()
+            ],
+        }
+
+    def merge(self, snapshot: Dict) -> None:
+        """Add the totals of another registry's snapshot to this one."""
+        for method, route, status, value in snapshot["requests"]:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + value
+        for name in ("request_latency", "upstream_latency"):
+            histograms = getattr(self, name)
+            for first, second, counts, total, count in snapshot[name]:
+                histogram = histograms.get((first, second))
+                if histogram is None:
+                    histogram = histograms[(first, second)] = Histogram()
+                histogram.add(counts, total, count)
+
+    def render(self) -> str:
+        lines: List[str] = [
+            "# HELP http_requests_total Total HTTP requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in sorted(self.requests.items()):
+            labels = _labels(method=method, route=route, status=str(status))
+            lines.append(f"http_requests_total{{{labels}}} {value}")
+
+        _render_histograms(
+            lines,
+            "http_request_duration_seconds",
+            "HTTP request latency by route.",
+            self.request_latency,
+            ("method", "route"),
+        )
+        _render_histograms(
+            lines,
+            "supabase_request_duration_seconds",
+            "Latency of upstream Supabase calls by operation and outcome.",
+            self.upstream_latency,
+            ("operation", "outcome"),
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _render_histograms(
+    lines: List[str],
+    name: str,
+    help_text: str,
+    histograms: Dict[Tuple[str, str], Histogram],
+    label_names: Tuple[str, str],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(histograms.items()):
+        base = _labels(**dict(zip(label_names, key)))
+        cumulative = 0
+        for bound, count in zip(histogram.bounds, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{base},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{base},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{base}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{base}}} {histogram.count}")
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count, status and latency per
+    route template. Requests that match no route share the label "unmatched".
+    """
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status,
+                time.perf_counter() - start,
+            )
+
+
+# Worker files are named "<pid>-<random>.json"; exited workers are folded
+# into RETIRED_FILE by the launcher
+WORKER_FILES = "[0-9]*-*.json"
+RETIRED_FILE = "retired.json"
+# How many folded file names the retired file remembers (see merge_directory)
+MAX_FOLDED_NAMES = 100
+
+
+class MetricsExporter:
+    """
+    Shares one worker's registry with the rest of a pre-forked pool.
+
+    Each worker writes its snapshot to its own file in `directory` every
+    `flush_interval` seconds and on shutdown; `render` flushes the calling
+    worker and merges every file, so any worker answering a scrape reports
+    totals for the whole pool. A worker's file only ever grows, so merged
+    counters never go backwards, and exited workers stay in the totals (the
+    launcher folds their files into one, see retire_worker).
+    """
+
+    def __init__(self, registry: Metrics, directory: str, flush_interval: float = 5.0):
+        self.registry = registry
+        self.directory = directory
+        self.flush_interval = flush_interval
+        # Unique per process, so a reused pid never overwrites an old file
+        self.path = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        self._task: Optional[asyncio.Task] = None
+
+    def flush(self) -> None:
+        write_snapshot(self.path, self.registry.snapshot())
+
+    def render(self) -> str:
+        self.flush()
+        return merge_directory(self.directory).render()
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._flush_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self.flush()
+
+
+def write_snapshot(path: str, snapshot: Dict) -> None:
+    # Write then rename, so readers never see a partial file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def _load(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def merge_directory(directory: str) -> Metrics:
+    # Worker files are read before the retired totals, and files the retired
+    # totals already include are skipped, so a worker being folded at the same
+    # moment is counted exactly once.
+    workers = {}
+    for path in glob.glob(os.path.join(directory, WORKER_FILES)):
+        snapshot = _load(path)
+        if snapshot is not None:
+            workers[os.path.basename(path)] = snapshot
+    retired = _load(os.path.join(directory, RETIRED_FILE)) or {"folded": [], "snapshot": None}
+
+    merged = Metrics()
+    if retired["snapshot"]:
+        merged.merge(retired["snapshot"])
+    folded = set(retired["folded"])
+    for name, snapshot in workers.items():
+        if name not in folded:
+            merged.merge(snapshot)
+    return merged
+
+
+def retire_worker(directory: str, pid: int) -> None:
+    """Fold an exited worker's files into the retired totals. Master only."""
+    paths = glob.glob(os.path.join(directory, f"{pid}-*.json"))
+    if not paths:
+        return
+    retired_path = os.path.join(directory, RETIRED_FILE)
+    retired = _load(retired_path) or {"folded": [], "snapshot": None}
+
+    merged = Metrics()
+    if retired["snapshot"]:
+        merged.merge(retired["snapshot"])
+    for path in paths:
+        snapshot = _load(path)
+        if snapshot is not None:
+            merged.merge(snapshot)
+    names = [os.path.basename(path) for path in paths]
+    write_snapshot(
+        retired_path,
+        {
+            "folded": (retired["folded"] + names)[-MAX_FOLDED_NAMES:],
+            "snapshot": merged.snapshot(),
+        },
+    )
+    for path in paths:
+        os.remove(path)
+
+
+@lru_cache()
+def get_metrics_exporter() -> Optional[MetricsExporter]:
+    """The exporter for this worker, or None outside a multi-worker pool."""
+    settings = get_settings()
+    if not settings.metrics_dir:
+        return None
+    return MetricsExporter(metrics, settings.metrics_dir, settings.metrics_flush_interval)
+
+
+def render_metrics() -> str:
+    exporter = get_metrics_exporter()
+    return exporter.render() if exporter is not None else metrics.render()
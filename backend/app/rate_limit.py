@@ -0,0 +1,158 @@
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi import HTTPException, Request
+
+from .config import get_settings
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string, holding at most `max_keys`
+    buckets. Each bucket is a two-item list `[tokens, last_refill]`; the
+    least recently touched bucket is dropped when the limit is reached, which
+    only ever forgets a key that has been idle the longest.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """Take one token. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.burst, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def normalize_email(email: str) -> str:
+    """Lowercase and drop any +tag so aliases share one bucket."""
+    local, _, domain = email.strip().lower().partition("@")
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+class LoginRateLimiter:
+    """Per-client-IP and per-email limits for login attempts."""
+
+    def __init__(self, by_ip: TokenBucketLimiter, by_email: TokenBucketLimiter):
+        self.by_ip = by_ip
+        self.by_email = by_email
+
+    def check(self, client_ip: str, email: str) -> None:
+        retry_after = max(
+            self.by_ip.hit(client_ip), self.by_email.hit(normalize_email(email))
+        )
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many login attempts. Please try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+class LoadShedder:
+    """
+    Caps in-flight upstream calls and sheds load when upstream latency climbs.
+
+    The effective limit is `max_concurrency` scaled down by how far the
+    moving average latency exceeds `latency_target`, never below one.
+    Requests over the limit are rejected with 503 instead of queueing.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        latency_target: float = 1.0,
+        smoothing: float = 0.2,
+    ):
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency = 0.0
+
+    @property
+    def limit(self) -> int:
+        if self.latency <= self.latency_target:
+            return self.max_concurrency
+        return max(1, int(self.max_concurrency * self.latency_target / self.latency))
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.in_flight >= self.limit:
+            raise HTTPException(
+                status_code=503,
+                detail="Service is busy. Please try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.latency += self.smoothing * (time.perf_counter() - start - self.latency)
+
+
+def client_ip(request: Request) -> str:
+    """
+    The client address for rate limiting. Behind trusted proxies, each one
+    appends the address it saw to X-Forwarded-For, so only the rightmost
+    `forwarded_for_hops` entries are trustworthy; anything to their left was
+    sent by the client and is ignored.
+    """
+    settings = get_settings()
+    if settings.trust_forwarded_for:
+        forwarded = [
+            entry.strip()
+            for entry in request.headers.get("x-forwarded-for", "").split(",")
+            if entry.strip()
+        ]
+        hops = max(1, settings.forwarded_for_hops)
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+@lru_cache()
+def get_login_limiter() -> LoginRateLimiter:
+    settings = get_settings()
+    return LoginRateLimiter(
+        by_ip=TokenBucketLimiter(
+            settings.login_ip_rate, settings.login_ip_burst, settings.rate_limit_max_keys
+        ),
+        by_email=TokenBucketLimiter(
+            settings.login_email_rate, settings.login_email_burst, settings.rate_limit_max_keys
+        ),
+    )
+
+
+@lru_cache()
+def get_login_shedder() -> LoadShedder:
+    settings = get_settings()
+    return LoadShedder(
+        max_concurrency=settings.login_max_concurrency,
+        latency_target=settings.login_latency_target,
+    )
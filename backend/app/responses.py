@@ -0,0 +1,38 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """
+    JSON response rendered by the model's compiled pydantic-core serializer,
+    skipping FastAPI's generic jsonable_encoder pass.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Optional[BaseModel]) -> bytes:
+        if content is None:
+            return b"null"
+        return content.model_dump_json().encode()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def conditional(request: Request, response: Response) -> Response:
+    """
+    Tag `response` with an ETag of its body, or replace it with a body-less
+    304 when the client's If-None-Match already has that version.
+    """
+    etag = make_etag(response.body)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,222 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from jose import jwt, JWTError
+
+from .config import get_settings
+from .supabase_client import get_supabase_client
+
+
+class SessionStore(ABC):
+    """
+    Key/value store for server-side session records.
+
+    Async so that an external cache (Redis, memcached) can implement it
+    without changing callers.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+
+class InMemorySessionStore(SessionStore):
+    """Per-process TTL store that evicts the least recently used entry when full."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight call."""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(future)
+
+
+class SessionManager:
+    """
+    Keeps the Supabase sessions handed out at login so access tokens can be
+    refreshed server-side.
+
+    Records are keyed per user and per Supabase session (`sub:session_id`
+    claims). A request is matched to its record only if it presents the exact
+    access token stored there (or the one it replaced), so the unverified
+    claims are used for lookup, never for authorization.
+
+    A token is refreshed once less than `refresh_fraction` of its lifetime
+    (or `refresh_margin` seconds, whichever is longer) remains, so any
+    request in the second half of a token's life renews it. Only a token
+    that has not yet expired can be refreshed, and the token it replaced keeps resolving to the new session for `refresh_grace` seconds
+    so requests that were already in flight are not logged out.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        refresh: Callable[[str], Awaitable[Dict]],
+        ttl: float = 7 * 24 * 3600,
+        refresh_margin: float = 60.0,
+        refresh_grace: float = 30.0,
+        refresh_fraction: float = 0.5,
+    ):
+        self.store = store
+        self.refresh = refresh
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.refresh_grace = refresh_grace
+        self.refresh_fraction = refresh_fraction
+        self._flights = SingleFlight()
+
+    @staticmethod
+    def key_for(access_token: str) -> Optional[str]:
+        try:
+            claims = jwt.get_unverified_claims(access_token)
+        except JWTError:
+            return None
+        if not claims.get("sub"):
+            return None
+        return f"{claims['sub']}:{claims.get('session_id', '')}"
+
+    async def save(self, session: Dict, previous_access_token: Optional[str] = None) -> None:
+        key = self.key_for(session["access_token"])
+        if key is None:
+            return
+        await self.store.set(
+            key,
+            {
+                "session": session,
+                "previous_access_token": previous_access_token,
+                "refreshed_at": time.time(),
+            },
+            self.ttl,
+        )
+
+    def _in_grace(self, record: Dict, access_token: str) -> bool:
+        # The token this session replaced, presented moments after the refresh
+        return (
+            access_token == record.get("previous_access_token")
+            and time.time() - record["refreshed_at"] <= self.refresh_grace
+        )
+
+    async def remove(self, access_token: str) -> None:
+        """Drop the session, but only for a caller holding one of its tokens."""
+        key = self.key_for(access_token)
+        if key is None:
+            return
+        record = await self.store.get(key)
+        if record is None:
+            return
+        if access_token == record["session"]["access_token"] or self._in_grace(
+            record, access_token
+        ):
+            await self.store.delete(key)
+
+    async def ensure_fresh(self, access_token: str) -> Optional[Dict]:
+        """
+        Return a newer session for `access_token` if there is one, refreshing
+        it upstream once it is in its refresh window. Returns None
+        when the presented token is current and not about to expire, when it
+        has already expired, or when the server has no session for it.
+        """
+        key = self.key_for(access_token)
+        if key is None:
+            return None
+        record = await self.store.get(key)
+        if record is None:
+            return None
+
+        session = record["session"]
+        if access_token != session["access_token"]:
+            # Another request refreshed this session moments ago
+            if self._in_grace(record, access_token):
+                return session
+            return None
+
+        remaining = _expires_at(session) - time.time()
+        if remaining <= 0:
+            # Too late to refresh: the user has to sign in again
+            await self.store.delete(key)
+            return None
+        window = max(self.refresh_margin, self.refresh_fraction * _lifetime(session))
+        if remaining > window:
+            return None
+        return await self._flights.do(key, lambda: self._refresh(key, session))
+
+    async def _refresh(self, key: str, session: Dict) -> Dict:
+        refreshed = await self.refresh(session["refresh_token"])
+        await self.save(refreshed, previous_access_token=session["access_token"])
+        return refreshed
+
+
+def _expires_at(session: Dict) -> float:
+    if session.get("expires_at"):
+        return session["expires_at"]
+    return jwt.get_unverified_claims(session["access_token"]).get("exp", 0)
+
+
+def _lifetime(session: Dict) -> float:
+    if session.get("expires_in"):
+        return session["expires_in"]
+    claims = jwt.get_unverified_claims(session["access_token"])
+    if "iat" in claims and "exp" in claims:
+        return claims["exp"] - claims["iat"]
+    return 0.0
+
+
+@lru_cache()
+def get_session_manager() -> SessionManager:
+    settings = get_settings()
+    return SessionManager(
+        InMemorySessionStore(max_entries=settings.session_store_max_entries),
+        # Resolve the client per call so refreshes survive a client restart
+        refresh=lambda refresh_token: get_supabase_client().refresh_session(refresh_token),
+        ttl=settings.session_ttl,
+        refresh_margin=settings.session_refresh_margin,
+        refresh_grace=settings.session_refresh_grace,
+        refresh_fraction=settings.session_refresh_fraction,
+    )
@@ -1,10 +1,182 @@
-from supabase import create_client
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
 from .config import get_settings
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    # httpx (and its CLI extras) is imported when the first client is built,
+    # keeping it out of the app's cold-import path.
+    import httpx
+
+
+class SupabaseError(Exception):
+    """Raised when a Supabase call fails or returns a non-2xx response."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AsyncSupabase:
+    """
+    Async access to the Supabase REST APIs (GoTrue and PostgREST) over one
+    shared, pooled httpx transport.
+
+    The client is stateless with respect to users: every call takes the
+    caller's access token explicitly instead of relying on a session stored
+    on the client. Upstream concurrency is bounded by a semaphore so a slow
+    Supabase cannot tie up every worker coroutine.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        max_concurrency: int = 50,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        import httpx
+
+        self.url = url.rstrip("/")
+        self.api_key = api_key
+        self._http = httpx.AsyncClient(
+            headers={"apikey": api_key},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            transport=transport,
+        )
+        self._transport_error = httpx.HTTPError
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        jwt: Optional[str] = None,
+        **kwargs,
+    ) -> "httpx.Response":
+        headers = kwargs.pop("headers", {})
+        headers["Authorization"] = f"Bearer {jwt or self.api_key}"
+        operation = f"{method} {path}"
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                response = await self._http.request(
+                    method, f"{self.url}{path}", headers=headers, **kwargs
+                )
+            except self._transport_error as e:
+                metrics.observe_upstream(operation, "transport_error", time.perf_counter() - start)
+                raise SupabaseError(f"{operation} failed: {e!r}") from e
+            metrics.observe_upstream(
+                operation,
+                "error" if response.is_error else "ok",
+                time.perf_counter() - start,
+            )
+
+        if response.is_error:
+            raise SupabaseError(_error_message(response), response.status_code)
+        return response
+
+    # GoTrue
+
+    async def sign_in_with_password(self, email: str, password: str) -> Dict[str, Any]:
+        response = await self.request(
+            "POST",
+            "/auth/v1/token",
+            params={"grant_type": "password"},
+            json={"email": email, "password": password},
+        )
+        return response.json()
+
+    async def refresh_session(self, refresh_token: str) -> Dict[str, Any]:
+        response = await self.request(
+            "POST",
+            "/auth/v1/token",
+            params={"grant_type": "refresh_token"},
+            json={"refresh_token": refresh_token},
+        )
+        return response.json()
+
+    async def get_user(self, jwt: str) -> Dict[str, Any]:
+        response = await self.request("GET", "/auth/v1/user", jwt=jwt)
+        return response.json()
+
+    async def sign_out(self, jwt: str) -> None:
+        await self.request("POST", "/auth/v1/logout", jwt=jwt)
+
+    async def get_jwks(self) -> Dict[str, Any]:
+        response = await self.request("GET", "/auth/v1/.well-known/jwks.json")
+        return response.json()
+
+    async def auth_health(self) -> Dict[str, Any]:
+        response = await self.request("GET", "/auth/v1/health")
+        return response.json()
+
+    # PostgREST
+
+    async def select(
+        self, table: str, columns: str = "*", limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        params = {"select": columns}
+        if limit is not None:
+            params["limit"] = str(limit)
+        response = await self.request("GET", f"/rest/v1/{table}", params=params)
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+def _error_message(response: "httpx.Response") -> str:
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text or response.reason_phrase
+    if not isinstance(body, dict):
+        return response.reason_phrase
+    return (
+        body.get("error_description")
+        or body.get("msg")
+        or body.get("message")
+        or body.get("error")
+        or response.reason_phrase
+    )
+
+
+_client: Optional[AsyncSupabase] = None
+
+
+def get_supabase_client() -> AsyncSupabase:
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = AsyncSupabase(
+            settings.supabase_url,
+            settings.supabase_anon_key,
+            max_connections=settings.supabase_max_connections,
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_keepalive_expiry,
+            timeout=settings.supabase_timeout,
+            connect_timeout=settings.supabase_connect_timeout,
+            max_concurrency=settings.supabase_max_concurrency,
+        )
+    return _client
 
-settings = get_settings()
 
-# Initialize Supabase client with anon key
-supabase = create_client(
-    settings.supabase_url,
-    settings.supabase_anon_key
-) 
\ No newline at end of file
+async def close_supabase_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,153 @@
+"""
+Minimal local stand-in for the Supabase GoTrue and PostgREST APIs, used by
+the benchmarks to measure the backend without a network round trip to a
+real project.
+"""
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from jose import jwt
+
+JWT_SECRET = "fake-supabase-jwt-secret"
+ANON_KEY = jwt.encode({"role": "anon", "iss": "supabase"}, JWT_SECRET, algorithm="HS256")
+
+
+def make_session(email: str, expires_in: int = 3600) -> dict:
+    now = int(time.time())
+    user = {
+        "id": str(uuid.uuid5(uuid.NAMESPACE_URL, email)),
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": email,
+        "app_metadata": {"provider": "email"},
+        "user_metadata": {},
+        "created_at": "2025-01-01T00:00:00Z",
+    }
+    access_token = jwt.encode(
+        {
+            "sub": user["id"],
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": email,
+            "iat": now,
+            "exp": now + expires_in,
+        },
+        JWT_SECRET,
+        algorithm="HS256",
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": uuid.uuid4().hex,
+        "token_type": "bearer",
+        "expires_in": expires_in,
+        "expires_at": now + expires_in,
+        "user": user,
+    }
+
+
+class FakeSupabaseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send(self, status: int, body=None) -> None:
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _bearer(self) -> str:
+        return self.headers.get("Authorization", "").removeprefix("Bearer ")
+
+    def _inject(self) -> bool:
+        """Apply simulated latency; return True if this request should fail."""
+        server = self.server
+        time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+        if server.error_rate and random.random() < server.error_rate:
+            self._send(500, {"message": "injected failure"})
+            return True
+        return False
+
+    def do_GET(self):
+        if self._inject():
+            return
+        path = urlparse(self.path).path
+        if path == "/auth/v1/health":
+            self._send(200, {"name": "GoTrue", "description": "fake"})
+        elif path == "/auth/v1/user":
+            try:
+                claims = jwt.decode(self._bearer(), JWT_SECRET, audience="authenticated")
+            except Exception:
+                self._send(401, {"msg": "invalid JWT"})
+                return
+            self._send(200, make_session(claims["email"])["user"])
+        elif path.startswith("/rest/v1/"):
+            self._send(200, [])
+        else:
+            self._send(404, {"message": "not found"})
+
+    def do_POST(self):
+        body = self._read_json()
+        if self._inject():
+            return
+        path = urlparse(self.path).path
+        if path == "/auth/v1/token":
+            self._send(200, make_session(body.get("email", "user@example.com")))
+        elif path == "/auth/v1/logout":
+            self._send(204)
+        else:
+            self._send(404, {"message": "not found"})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under benchmark concurrency
+    request_queue_size = 1024
+
+
+class FakeSupabase:
+    """
+    Run the fake server on a background thread: `with FakeSupabase() as url:`.
+
+    Every request sleeps `latency` +/- `jitter` seconds, then fails with a 500
+    with probability `error_rate`.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.server = _Server((host, port), FakeSupabaseHandler)
+        self.server.latency = latency
+        self.server.jitter = jitter
+        self.server.error_rate = error_rate
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> str:
+        self._thread.start()
+        return self.url
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
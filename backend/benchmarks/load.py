@@ -0,0 +1,226 @@
+"""
+Load and latency benchmark for the auth and health endpoints.
+
+Starts the local fake Supabase, launches the app under uvicorn pointed at
+it, and drives each scenario at a fixed concurrency. Reports throughput and
+p50/p95/p99 latency per scenario, optionally saving the results as JSON
+and comparing them against a previous run.
+
+    python -m benchmarks.load --concurrency 32 --requests 2000 --latency 0.02 \\
+        --output results.json --baseline baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from .fake_supabase import ANON_KEY, JWT_SECRET, FakeSupabase
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCENARIOS = ["health", "ready", "login", "user", "signout"]
+
+# Limits are lifted so the benchmark measures the request path rather than
+# the rate limiter rejecting a single client IP.
+SERVER_ENV = {
+    "SUPABASE_ANON_KEY": ANON_KEY,
+    "SUPABASE_SERVICE_ROLE_KEY": ANON_KEY,
+    "SUPABASE_JWT_SECRET": JWT_SECRET,
+    "LOGIN_IP_RATE": "1000000",
+    "LOGIN_IP_BURST": "1000000",
+    "LOGIN_EMAIL_RATE": "1000000",
+    "LOGIN_EMAIL_BURST": "1000000",
+    "LOGIN_MAX_CONCURRENCY": "100000",
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    make_request: Callable[[int], Callable],
+    requests: int,
+    concurrency: int,
+) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await make_request(i)()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_scenarios(base_url: str, scenarios: List[str], requests: int, concurrency: int) -> Dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        # Retry the setup login, since upstream errors may be injected
+        for _ in range(20):
+            login = await client.post(
+                "/api/auth/login", json={"email": "bench@example.com", "password": "pw"}
+            )
+            if login.status_code == 200:
+                break
+        login.raise_for_status()
+        # The cookie is Secure, so pass it explicitly over plain HTTP
+        cookie = {"Cookie": f"sb-access-token={login.cookies['sb-access-token']}"}
+
+        requests_by_scenario = {
+            "health": lambda i: lambda: client.get("/api/health"),
+            "ready": lambda i: lambda: client.get("/api/health/ready"),
+            "login": lambda i: lambda: client.post(
+                "/api/auth/login", json={"email": f"user{i}@example.com", "password": "pw"}
+            ),
+            "user": lambda i: lambda: client.get("/api/auth/user", headers=cookie),
+            "signout": lambda i: lambda: client.post("/api/auth/signout", headers=cookie),
+        }
+        results = {}
+        for name in scenarios:
+            # Short warm-up so connection setup is not counted
+            await drive(client, requests_by_scenario[name], min(requests, concurrency * 2), concurrency)
+            results[name] = await drive(client, requests_by_scenario[name], requests, concurrency)
+        return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server at {base_url} did not come up within {timeout}s")
+
+
+def server_command(port: int) -> List[str]:
+    return [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--port", str(port), "--log-level", "warning",
+    ]
+
+
+def run(
+    scenarios: List[str],
+    requests: int,
+    concurrency: int,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    command: Optional[Callable[[int], List[str]]] = None,
+) -> Dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with FakeSupabase(latency=latency, jitter=jitter, error_rate=error_rate) as supabase_url:
+        env = dict(os.environ, SUPABASE_URL=supabase_url, **SERVER_ENV)
+        server = subprocess.Popen((command or server_command)(port), cwd=BACKEND_DIR, env=env)
+        try:
+            wait_for_server(base_url)
+            results = asyncio.run(run_scenarios(base_url, scenarios, requests, concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+    return {
+        "config": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "latency": latency,
+            "jitter": jitter,
+            "error_rate": error_rate,
+        },
+        "scenarios": results,
+    }
+
+
+def print_report(results: Dict, baseline: Optional[Dict] = None) -> None:
+    print(f"{'scenario':<10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, stats in results["scenarios"].items():
+        print(
+            f"{name:<10}{stats['throughput_rps']:>10.1f}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['errors']:>8}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous:
+            deltas = "".join(
+                f"{_delta(stats[key], previous[key]):>10}"
+                for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+            )
+            print(f"{'  vs base':<10}{deltas}")
+
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.0, help="upstream latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- upstream latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream 500s")
+    parser.add_argument("--output", type=Path, help="save results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a saved JSON run")
+    args = parser.parse_args()
+
+    results = run(
+        args.scenarios,
+        args.requests,
+        args.concurrency,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_report(results, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
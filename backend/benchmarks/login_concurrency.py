@@ -0,0 +1,81 @@
+"""
+Concurrent-login throughput: blocking supabase-py calls vs the async pooled
+client.
+
+The "blocking" variant reproduces the previous AuthService.login, which
+called the synchronous supabase client from inside an async handler. The
+"async" variant runs the current AuthService.login. Both talk to the local
+fake Supabase with the same simulated upstream latency.
+
+    python -m benchmarks.login_concurrency --requests 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from .fake_supabase import ANON_KEY, JWT_SECRET, FakeSupabase
+
+
+async def run(login, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await login(f"user{i}@example.com")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per upstream call")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with FakeSupabase(latency=args.latency) as url:
+        os.environ.update(
+            SUPABASE_URL=url,
+            SUPABASE_ANON_KEY=ANON_KEY,
+            SUPABASE_SERVICE_ROLE_KEY=ANON_KEY,
+            SUPABASE_JWT_SECRET=JWT_SECRET,
+        )
+        from supabase import create_client
+        from supabase.lib.client_options import ClientOptions
+
+        from app.auth import AuthService, LoginCredentials
+        from app.supabase_client import close_supabase_client
+
+        sync_client = create_client(
+            url, ANON_KEY, ClientOptions(auto_refresh_token=False, persist_session=False)
+        )
+
+        async def blocking_login(email: str):
+            sync_client.auth.sign_in_with_password({"email": email, "password": "pw"})
+
+        async def async_login(email: str):
+            await AuthService.login(LoginCredentials(email=email, password="pw"))
+
+        async def compare():
+            before = await run(blocking_login, args.requests, args.concurrency)
+            after = await run(async_login, args.requests, args.concurrency)
+            await close_supabase_client()
+            return before, after
+
+        before, after = asyncio.run(compare())
+
+    print(
+        f"{args.requests} logins, concurrency {args.concurrency}, "
+        f"upstream latency {args.latency * 1000:.0f} ms"
+    )
+    print(f"  blocking supabase-py: {before:8.1f} logins/s")
+    print(f"  async pooled client:  {after:8.1f} logins/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Per-request cost of MetricsMiddleware.
+
+Calls a trivial ASGI app directly and through the middleware, with a
+FastAPI-style route in the scope, and reports the difference per request
+(best of `--runs`). Exits non-zero when the overhead exceeds its budget,
+so CI can track it.
+
+    python -m benchmarks.metrics_overhead --requests 200000 --budget-us 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from app.metrics import Metrics, MetricsMiddleware
+
+ROUTE = SimpleNamespace(path="/api/auth/user")
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b"{}"}
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = ROUTE
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def per_request(app, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/api/auth/user"}, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-us", type=float, default=5.0)
+    args = parser.parse_args()
+
+    wrapped = MetricsMiddleware(endpoint, registry=Metrics())
+    bare = min(asyncio.run(per_request(endpoint, args.requests)) for _ in range(args.runs))
+    measured = min(asyncio.run(per_request(wrapped, args.requests)) for _ in range(args.runs))
+    overhead_us = (measured - bare) * 1e6
+    print(f"{args.requests} requests, best of {args.runs} runs")
+    print(f"  bare ASGI app:           {bare * 1e6:6.2f} us/request")
+    print(f"  with MetricsMiddleware:  {measured * 1e6:6.2f} us/request")
+    print(f"  middleware overhead:     {overhead_us:6.2f} us/request (budget {args.budget_us:.1f})")
+    sys.exit(1 if overhead_us > args.budget_us else 0)
+
+
+if __name__ == "__main__":
+    main()
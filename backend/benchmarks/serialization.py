@@ -0,0 +1,91 @@
+"""
+Serialization cost and bytes on the wire for /api/auth/user.
+
+"before" is the previous path: the GoTrue user returned untyped and
+rendered through jsonable_encoder + JSONResponse. "after" is the typed
+User model rendered by ModelResponse, plus the body-less 304 returned when
+the client's ETag still matches. Both render the same fields, so the
+bodies are the same size and only the rendering path differs.
+
+    python -m benchmarks.serialization --iterations 50000
+"""
+import argparse
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.auth import User
+from app.responses import ModelResponse
+
+# Shape of a GoTrue /auth/v1/user response for an email/password user
+GOTRUE_USER = {
+    "id": "0c2b5e4c-5d5e-4a47-9f6a-2f7a8f0f1a11",
+    "aud": "authenticated",
+    "role": "authenticated",
+    "email": "test@example.com",
+    "email_confirmed_at": "2025-01-20T10:12:31.123456Z",
+    "phone": "",
+    "confirmation_sent_at": "2025-01-20T10:11:02.654321Z",
+    "confirmed_at": "2025-01-20T10:12:31.123456Z",
+    "last_sign_in_at": "2025-01-28T06:39:08.112233Z",
+    "app_metadata": {"provider": "email", "providers": ["email"]},
+    "user_metadata": {},
+    "identities": [
+        {
+            "identity_id": "5f1d9a0e-8f7b-4b3c-9d2e-1a2b3c4d5e6f",
+            "id": "0c2b5e4c-5d5e-4a47-9f6a-2f7a8f0f1a11",
+            "user_id": "0c2b5e4c-5d5e-4a47-9f6a-2f7a8f0f1a11",
+            "identity_data": {
+                "email": "test@example.com",
+                "email_verified": False,
+                "phone_verified": False,
+                "sub": "0c2b5e4c-5d5e-4a47-9f6a-2f7a8f0f1a11",
+            },
+            "provider": "email",
+            "last_sign_in_at": "2025-01-20T10:11:02.600000Z",
+            "created_at": "2025-01-20T10:11:02.600000Z",
+            "updated_at": "2025-01-20T10:11:02.600000Z",
+            "email": "test@example.com",
+        }
+    ],
+    "created_at": "2025-01-20T10:11:02.590000Z",
+    "updated_at": "2025-01-28T06:39:08.120000Z",
+    "is_anonymous": False,
+}
+
+
+def per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    user = User.model_validate(GOTRUE_USER)
+    # The untyped payload with every field the model renders, unset ones as null
+    untyped = user.model_dump(mode="json")
+    before_body = JSONResponse(jsonable_encoder(untyped)).body
+    after_body = ModelResponse(user).body
+    assert len(before_body) == len(after_body)
+
+    before = per_call(lambda: JSONResponse(jsonable_encoder(untyped)).body, args.iterations)
+    after = per_call(lambda: ModelResponse(user).body, args.iterations)
+    validate_and_render = per_call(
+        lambda: ModelResponse(User.model_validate(GOTRUE_USER)).body, args.iterations
+    )
+
+    print(f"{args.iterations} iterations")
+    print(f"  before: jsonable_encoder + JSONResponse  {before * 1e6:7.2f} us  {len(before_body):5d} bytes")
+    print(f"  after:  ModelResponse(User)              {after * 1e6:7.2f} us  {len(after_body):5d} bytes")
+    print(f"  after, incl. model validation            {validate_and_render * 1e6:7.2f} us")
+    print(f"  after, unchanged user (304)                   -        0 bytes")
+
+
+if __name__ == "__main__":
+    main()
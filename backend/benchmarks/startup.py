@@ -0,0 +1,98 @@
+"""
+Cold-start budget check: app import time and time to first response.
+
+Each measurement runs in a fresh interpreter. "Import" is the time to
+`import app.main`; "first response" is the time from launching uvicorn to
+the first 200 from GET /api/health. Exits non-zero when the median of
+either exceeds its budget, so CI can track it.
+
+    python -m benchmarks.startup --runs 5 --import-budget-ms 1500 --first-response-budget-ms 4000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from .fake_supabase import ANON_KEY, FakeSupabase
+from .load import free_port
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import(env: dict) -> float:
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, text=True
+    )
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_response(env: dict, timeout: float = 30.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise RuntimeError(f"No response from uvicorn within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--first-response-budget-ms", type=float, default=4000)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    with FakeSupabase() as url:
+        env = dict(
+            os.environ,
+            SUPABASE_URL=url,
+            SUPABASE_ANON_KEY=ANON_KEY,
+            SUPABASE_SERVICE_ROLE_KEY=ANON_KEY,
+        )
+        imports = [measure_import(env) for _ in range(args.runs)]
+        first_responses = [measure_first_response(env) for _ in range(args.runs)]
+
+    results = {
+        "import_ms": round(statistics.median(imports) * 1000, 1),
+        "first_response_ms": round(statistics.median(first_responses) * 1000, 1),
+        "import_budget_ms": args.import_budget_ms,
+        "first_response_budget_ms": args.first_response_budget_ms,
+    }
+    print(f"cold import of app.main:  {results['import_ms']:7.1f} ms (budget {args.import_budget_ms:.0f})")
+    print(f"time to first response:   {results['first_response_ms']:7.1f} ms (budget {args.first_response_budget_ms:.0f})")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    over_budget = (
+        results["import_ms"] > args.import_budget_ms
+        or results["first_response_ms"] > args.first_response_budget_ms
+    )
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
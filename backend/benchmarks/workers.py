@@ -0,0 +1,66 @@
+"""
+Throughput across worker counts for the production launcher.
+
+Runs the load benchmark against `python -m app.launcher --workers N` for
+each N and prints one row per worker count. Results scale with the CPUs
+available to the machine running the benchmark (the fake Supabase and the
+load generator share them).
+
+    python -m benchmarks.workers --workers 1 2 4 --scenarios health user --requests 3000
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from . import load
+
+
+def launcher_command(workers: int):
+    def command(port: int):
+        return [
+            sys.executable, "-m", "app.launcher",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ]
+
+    return command
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--scenarios", nargs="+", choices=load.SCENARIOS, default=["health", "user"])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, help="save results as JSON")
+    args = parser.parse_args()
+
+    runs = {}
+    for workers in args.workers:
+        runs[workers] = load.run(
+            args.scenarios,
+            args.requests,
+            args.concurrency,
+            latency=args.latency,
+            command=launcher_command(workers),
+        )
+
+    header = "".join(f"{name + ' rps':>14}{name + ' p99':>12}" for name in args.scenarios)
+    print(f"{'workers':<8}{header}")
+    for workers, result in runs.items():
+        row = "".join(
+            f"{result['scenarios'][name]['throughput_rps']:>14.1f}"
+            f"{result['scenarios'][name]['p99_ms']:>12.2f}"
+            for name in args.scenarios
+        )
+        print(f"{workers:<8}{row}")
+
+    if args.output:
+        args.output.write_text(json.dumps(runs, indent=2))
+
+
+if __name__ == "__main__":
+    main()
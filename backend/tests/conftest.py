@@ -1,10 +1,38 @@
+import os
+import time
+
 import pytest
 from fastapi.testclient import TestClient
+from jose import jwt
 from app.main import app
 
+JWT_SECRET = "test-jwt-secret"
+
+# Nothing listens on the discard port, so upstream calls fail fast unless a
+# test provides its own Supabase stand-in.
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-service-role-key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", JWT_SECRET)
+
+
+def make_access_token(expires_in: int = 3600, **claims) -> str:
+    """A Supabase user access token signed with the test project secret."""
+    payload = {
+        "sub": "user-123",
+        "aud": "authenticated",
+        "email": "test@example.com",
+        "role": "authenticated",
+        "exp": int(time.time()) + expires_in,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+
 @pytest.fixture
 def client():
-    return TestClient(app)
+    # Run the app lifespan so pooled upstream connections are closed per test
+    with TestClient(app) as client:
+        yield client
 
 @pytest.fixture
 def test_user():
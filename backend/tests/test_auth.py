@@ -1,4 +1,12 @@
+import json
+import time
+
 from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.auth import User
+
+from .conftest import JWT_SECRET, make_access_token
 
 def test_auth_endpoints(client: TestClient):
     # Test login endpoint exists
@@ -10,4 +18,84 @@ def test_auth_endpoints(client: TestClient):
 
     # Test user endpoint exists
     response = client.get("/api/auth/user")
-    assert response.status_code in [401, 200]  # Either unauthorized or success 
\ No newline at end of file
+    assert response.status_code in [401, 200]  # Either unauthorized or success 
+
+
+def test_user_model_keeps_the_full_gotrue_record():
+    gotrue_user = {
+        "id": "user-123",
+        "aud": "authenticated",
+        "email": "test@example.com",
+        "email_confirmed_at": "2025-01-20T10:12:31.123456Z",
+        "last_sign_in_at": "2025-01-28T06:39:08.112233Z",
+        "identities": [
+            {
+                "identity_id": "identity-1",
+                "id": "user-123",
+                "user_id": "user-123",
+                "identity_data": {"email": "test@example.com"},
+                "provider": "email",
+                "created_at": "2025-01-20T10:11:02.600000Z",
+                "last_sign_in_at": "2025-01-20T10:11:02.600000Z",
+                "updated_at": "2025-01-20T10:11:02.600000Z",
+            }
+        ],
+        "created_at": "2025-01-20T10:11:02.590000Z",
+        "is_anonymous": False,
+        # Fields from newer GoTrue versions pass through as well
+        "is_sso_user": False,
+    }
+    rendered = json.loads(User.model_validate(gotrue_user).model_dump_json())
+    for key, value in gotrue_user.items():
+        assert rendered[key] == value
+
+
+def test_user_supports_conditional_get(client: TestClient):
+    cookie = {"Cookie": f"sb-access-token={make_access_token()}"}
+
+    response = client.get("/api/auth/user", headers=cookie)
+    assert response.status_code == 200
+    assert response.json()["email"] == "test@example.com"
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = client.get("/api/auth/user", headers={**cookie, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_api_keys_are_not_sessions(client: TestClient):
+    # Shaped like the project's anon and service_role keys: same secret,
+    # but no subject, no audience and a non-user role
+    for role in ("anon", "service_role"):
+        api_key = jwt.encode(
+            {"iss": "supabase", "role": role, "exp": int(time.time()) + 3600},
+            JWT_SECRET,
+            algorithm="HS256",
+        )
+        response = client.get("/api/auth/user", headers={"Cookie": f"sb-access-token={api_key}"})
+        assert response.status_code == 401
+
+
+def test_user_is_rejected_after_signout(client: TestClient):
+    # Distinct claims so the revoked token is not shared with other tests
+    token = make_access_token(session_id="signed-out")
+    cookie = {"Cookie": f"sb-access-token={token}"}
+    assert client.get("/api/auth/user", headers=cookie).status_code == 200
+
+    # Upstream is unreachable here, but the token is revoked locally anyway
+    client.post("/api/auth/signout", headers=cookie)
+    assert client.get("/api/auth/user", headers=cookie).status_code == 401
+
+
+def test_cors_preflight_is_cacheable(client: TestClient):
+    response = client.options(
+        "/api/auth/user",
+        headers={
+            "Origin": "http://localhost:5177",
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-max-age"] == "7200"
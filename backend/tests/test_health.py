@@ -1,5 +1,12 @@
+import asyncio
+import time
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.health import HealthMonitor
+
+
 def test_health_check(client: TestClient):
     response = client.get("/api/health")
     assert response.status_code == 200
@@ -8,4 +15,75 @@ def test_health_check(client: TestClient):
 def test_root_endpoint(client: TestClient):
     response = client.get("/")
     assert response.status_code == 200
-    assert response.json() == {"message": "Backend server is running"} 
\ No newline at end of file
+    assert response.json() == {"message": "Backend server is running"} 
+
+def test_readiness_reports_unreachable_supabase(client: TestClient):
+    response = client.get("/api/health/ready")
+    assert response.status_code == 503
+    detail = response.json()["detail"]
+    assert detail["status"] == "unhealthy"
+    assert detail["services"]["supabase_auth"]["status"] == "unhealthy"
+    assert detail["services"]["supabase_db"]["status"] == "unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_monitor_runs_checks_concurrently_with_timeouts():
+    monitor = HealthMonitor(default_timeout=0.5)
+
+    async def slow():
+        await asyncio.sleep(0.2)
+
+    async def hung():
+        await asyncio.sleep(10)
+
+    monitor.register("slow_a", slow)
+    monitor.register("slow_b", slow)
+    monitor.register("hung", hung, timeout=0.1)
+
+    start = time.perf_counter()
+    results = await monitor.get_results()
+    assert time.perf_counter() - start < 0.35
+
+    checks = results["checks"]
+    assert checks["slow_a"]["status"] == "healthy"
+    assert checks["slow_b"]["status"] == "healthy"
+    assert checks["hung"]["status"] == "unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_monitor_caches_results_and_shares_refreshes():
+    calls = 0
+
+    async def check():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"calls": calls}
+
+    monitor = HealthMonitor(ttl=60)
+    monitor.register("counter", check)
+
+    await asyncio.gather(*(monitor.get_results() for _ in range(5)))
+    await monitor.get_results()
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_probes_share_the_background_refresh():
+    calls = 0
+
+    async def check():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+
+    monitor = HealthMonitor(ttl=60, refresh_interval=60)
+    monitor.register("counter", check)
+    monitor.start()
+    try:
+        # Probes arriving before the first background refresh completes
+        await asyncio.sleep(0)
+        await asyncio.gather(*(monitor.get_results() for _ in range(5)))
+        assert calls == 1
+    finally:
+        await monitor.stop()
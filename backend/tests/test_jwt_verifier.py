@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from jose import jwt, JWTError
+
+from app.jwt_verifier import TokenVerifier, user_from_claims
+
+from .conftest import JWT_SECRET, make_access_token
+
+
+@pytest.mark.asyncio
+async def test_verifies_and_caches_claims():
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET)
+    token = make_access_token()
+
+    claims = await verifier.verify(token)
+    assert claims["sub"] == "user-123"
+    assert verifier.get_cached(token) == claims
+    assert user_from_claims(claims)["email"] == "test@example.com"
+
+
+@pytest.mark.asyncio
+async def test_rejects_bad_signature_and_expired_tokens():
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET)
+
+    forged = jwt.encode({"sub": "x", "exp": int(time.time()) + 60}, "other", algorithm="HS256")
+    with pytest.raises(JWTError):
+        await verifier.verify(forged)
+
+    with pytest.raises(JWTError):
+        await verifier.verify(make_access_token(expires_in=-10))
+
+
+@pytest.mark.asyncio
+async def test_rejects_tokens_without_user_claims():
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET)
+
+    for token in (
+        make_access_token(role="anon"),
+        make_access_token(role="service_role"),
+        jwt.encode({"role": "authenticated", "aud": "authenticated",
+                    "exp": int(time.time()) + 60}, JWT_SECRET, algorithm="HS256"),
+        jwt.encode({"sub": "user-123", "role": "authenticated",
+                    "exp": int(time.time()) + 60}, JWT_SECRET, algorithm="HS256"),
+    ):
+        with pytest.raises(JWTError):
+            await verifier.verify(token)
+
+
+@pytest.mark.asyncio
+async def test_unknown_tokens_fall_back_without_secret():
+    verifier = TokenVerifier(jwt_secret=None)
+    assert await verifier.verify(make_access_token()) is None
+
+
+def test_cache_is_bounded_lru():
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET, max_entries=2)
+    exp = int(time.time()) + 60
+    verifier.remember("a", {"exp": exp})
+    verifier.remember("b", {"exp": exp})
+    verifier.get_cached("a")
+    verifier.remember("c", {"exp": exp})
+
+    assert verifier.get_cached("b") is None
+    assert verifier.get_cached("a") is not None
+    assert verifier.get_cached("c") is not None
+
+    verifier.invalidate("a")
+    assert verifier.get_cached("a") is None
+
+
+@pytest.mark.asyncio
+async def test_revoked_tokens_stay_rejected_until_expiry():
+    verifier = TokenVerifier(jwt_secret=JWT_SECRET, max_revoked=1)
+    token = make_access_token()
+    claims = await verifier.verify(token)
+
+    verifier.revoke(token, claims["exp"])
+    with pytest.raises(JWTError):
+        await verifier.verify(token)
+    verifier.remember(token, claims)
+    assert verifier.get_cached(token) is None
+
+    # The denylist is bounded: the oldest entry makes way
+    other = make_access_token(sub="user-456")
+    verifier.revoke(other, claims["exp"])
+    assert not verifier.is_revoked(token)
+    assert verifier.is_revoked(other)
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Run in a fresh interpreter: this test process has already used the app
+IMPORT_ONLY = """
+import app.main
+from app import config, health, jwt_verifier, logging_config, metrics, rate_limit
+from app import session_store, supabase_client
+
+getters = [
+    config.get_settings,
+    health.get_health_monitor,
+    jwt_verifier.get_token_verifier,
+    metrics.get_metrics_exporter,
+    rate_limit.get_login_limiter,
+    rate_limit.get_login_shedder,
+    session_store.get_session_manager,
+]
+assert all(getter.cache_info().currsize == 0 for getter in getters)
+assert supabase_client._client is None
+assert logging_config._listener is None
+"""
+
+
+def test_importing_the_app_builds_no_per_process_state():
+    # The preloading master forks workers after this import, so anything
+    # built here would be shared by every worker
+    subprocess.run(
+        [sys.executable, "-c", IMPORT_ONLY], cwd=BACKEND_DIR, env={}, check=True
+    )
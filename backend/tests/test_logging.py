@@ -0,0 +1,55 @@
+import json
+import logging
+import queue
+
+from fastapi.testclient import TestClient
+
+from app.logging_config import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RateLimitFilter,
+    RequestIdFilter,
+    request_id_var,
+)
+
+
+def make_record(msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("app.auth", logging.WARNING, __file__, 1, msg, args, None)
+
+
+def test_json_records_carry_request_id_and_extras():
+    token = request_id_var.set("req-123")
+    try:
+        record = make_record("Login failed: %s", "invalid credentials")
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+    record.email_domain = "example.com"
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Login failed: invalid credentials"
+    assert entry["request_id"] == "req-123"
+    assert entry["level"] == "WARNING"
+    assert entry["email_domain"] == "example.com"
+
+
+def test_repeated_errors_are_rate_limited():
+    limiter = RateLimitFilter(limit=3, window=60)
+    allowed = [limiter.filter(make_record("Login failed: %s", i)) for i in range(10)]
+    assert allowed.count(True) == 3
+
+    # A different message template has its own budget
+    assert limiter.filter(make_record("Get user failed: %s", "x"))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+    assert handler.dropped == 1
+
+
+def test_request_id_is_echoed_or_generated(client: TestClient):
+    response = client.get("/api/health", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+    assert len(client.get("/api/health").headers["x-request-id"]) == 32
@@ -0,0 +1,51 @@
+import os
+
+from fastapi.testclient import TestClient
+
+from app.metrics import (
+    RETIRED_FILE,
+    Histogram,
+    Metrics,
+    MetricsExporter,
+    merge_directory,
+    retire_worker,
+)
+
+
+def test_histogram_buckets_are_cumulative_on_render():
+    registry = Metrics()
+    for seconds in (0.001, 0.005, 0.2, 30):
+        registry.observe_upstream("GET /auth/v1/user", "ok", seconds)
+
+    text = registry.render()
+    labels = 'operation="GET /auth/v1/user",outcome="ok"'
+    assert f'supabase_request_duration_seconds_bucket{{{labels},le="0.005"}} 2' in text
+    assert f'supabase_request_duration_seconds_bucket{{{labels},le="0.25"}} 3' in text
+    assert f'supabase_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in text
+    assert f"supabase_request_duration_seconds_count{{{labels}}} 4" in text
+
+
+def test_histogram_overflow_slot():
+    histogram = Histogram(bounds=(1.0,))
+    histogram.observe(1.0)
+    histogram.observe(2.0)
+    assert histogram.counts == [1, 1]
+
+
+def test_render_merges_every_worker_and_keeps_retired_ones(tmp_path):
+    workers = []
+    for _ in range(2):
+        registry = Metrics()
+        registry.observe_request("GET", "/api/health", 200, 0.01)
+        workers.append(MetricsExporter(registry, str(tmp_path)))
+    workers[1].flush()
+
+    text = workers[0].render()
+    assert 'http_requests_total{method="GET",route="/api/health",status="200"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/health"} 2' in text
+
+    # The master folds an exited worker into the retired totals
+    retire_worker(str(tmp_path), os.getpid())
+    assert sorted(os.listdir(tmp_path)) == [RETIRED_FILE]
+    merged = merge_directory(str(tmp_path))
+    assert merged.requests[("GET", "/api/health", 200)] == 2
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app import rate_limit
+from app.rate_limit import (
+    LoadShedder,
+    TokenBucketLimiter,
+    client_ip,
+    get_login_limiter,
+    normalize_email,
+)
+
+
+@pytest.fixture
+def fresh_limiter():
+    get_login_limiter.cache_clear()
+    yield get_login_limiter()
+    get_login_limiter.cache_clear()
+
+
+def test_bucket_allows_burst_then_refills():
+    limiter = TokenBucketLimiter(rate=1.0, burst=3)
+    assert [limiter.hit("k", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.hit("k", now=0.0) == pytest.approx(1.0)
+    assert limiter.hit("k", now=1.5) == 0.0
+
+
+def test_bucket_memory_is_bounded():
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_keys=100)
+    for i in range(1000):
+        limiter.hit(f"10.0.0.{i}", now=0.0)
+    assert len(limiter) == 100
+
+
+def test_email_aliases_share_a_bucket():
+    assert normalize_email(" Test+spam@Example.com ") == "test@example.com"
+
+
+def test_login_returns_429_with_retry_after(client: TestClient, fresh_limiter):
+    credentials = {"email": "victim@example.com", "password": "guess"}
+    for _ in range(int(fresh_limiter.by_email.burst)):
+        assert client.post("/api/auth/login", json=credentials).status_code == 401
+
+    response = client.post(
+        "/api/auth/login", json={**credentials, "email": "Victim+1@example.com"}
+    )
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_shedder_rejects_over_capacity_and_adapts_to_latency():
+    shedder = LoadShedder(max_concurrency=2, latency_target=0.1)
+    async with shedder.slot():
+        async with shedder.slot():
+            with pytest.raises(HTTPException) as excinfo:
+                async with shedder.slot():
+                    pass
+    assert excinfo.value.status_code == 503
+    assert shedder.in_flight == 0
+
+    shedder.latency = 0.4
+    assert shedder.limit == 1
+
+
+@pytest.mark.parametrize("hops, expected", [(1, "10.0.0.7"), (2, "203.0.113.9")])
+def test_client_ip_ignores_spoofed_forwarded_for(monkeypatch, hops, expected):
+    settings = SimpleNamespace(trust_forwarded_for=True, forwarded_for_hops=hops)
+    monkeypatch.setattr(rate_limit, "get_settings", lambda: settings)
+    # The client sent a fake leftmost entry; the proxies appended the rest
+    request = Request({
+        "type": "http",
+        "headers": [(b"x-forwarded-for", b"1.2.3.4, 203.0.113.9, 10.0.0.7")],
+        "client": ("10.0.0.1", 1234),
+    })
+    assert client_ip(request) == expected
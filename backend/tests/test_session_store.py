@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+import pytest
+from jose import jwt
+
+from app import auth
+from app.session_store import InMemorySessionStore, SessionManager
+from app.supabase_client import SupabaseError
+
+
+def make_session(expires_in: int, n: int = 0, lifetime: int = 3600) -> dict:
+    exp = int(time.time()) + expires_in
+    token = jwt.encode(
+        {"sub": "user-1", "session_id": "s-1", "exp": exp, "n": n}, "secret", algorithm="HS256"
+    )
+    return {
+        "access_token": token,
+        "refresh_token": f"r-{n}",
+        "expires_in": lifetime,
+        "expires_at": exp,
+    }
+
+
+def make_manager(refresh_calls: list) -> SessionManager:
+    async def refresh(refresh_token: str) -> dict:
+        refresh_calls.append(refresh_token)
+        await asyncio.sleep(0.01)
+        return make_session(3600, n=len(refresh_calls))
+
+    return SessionManager(InMemorySessionStore(), refresh, refresh_margin=60)
+
+
+@pytest.mark.asyncio
+async def test_store_expires_and_evicts_lru():
+    store = InMemorySessionStore(max_entries=2)
+    await store.set("a", {"v": 1}, ttl=60)
+    await store.set("b", {"v": 2}, ttl=60)
+    await store.get("a")
+    await store.set("c", {"v": 3}, ttl=60)
+    assert await store.get("b") is None
+    assert await store.get("a") == {"v": 1}
+
+    await store.set("d", {"v": 4}, ttl=-1)
+    assert await store.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_fresh_sessions_are_not_refreshed():
+    calls = []
+    manager = make_manager(calls)
+    session = make_session(3600)
+    await manager.save(session)
+
+    assert await manager.ensure_fresh(session["access_token"]) is None
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_refreshes_in_second_half_of_lifetime():
+    calls = []
+    manager = make_manager(calls)
+    # 40 of 60 minutes used: well before the last-minute margin
+    session = make_session(20 * 60)
+    await manager.save(session)
+
+    refreshed = await manager.ensure_fresh(session["access_token"])
+    assert refreshed is not None
+    assert calls == ["r-0"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_collapse_into_one_call():
+    calls = []
+    manager = make_manager(calls)
+    session = make_session(30)
+    await manager.save(session)
+
+    results = await asyncio.gather(
+        *(manager.ensure_fresh(session["access_token"]) for _ in range(10))
+    )
+    assert calls == ["r-0"]
+    assert len({r["access_token"] for r in results}) == 1
+
+    # A late request still holding the replaced token gets the new session
+    late = await manager.ensure_fresh(session["access_token"])
+    assert late["access_token"] == results[0]["access_token"]
+    assert calls == ["r-0"]
+
+
+@pytest.mark.asyncio
+async def test_remove_evicts_session():
+    calls = []
+    manager = make_manager(calls)
+    session = make_session(30)
+    await manager.save(session)
+    await manager.remove(session["access_token"])
+
+    assert await manager.ensure_fresh(session["access_token"]) is None
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_expired_tokens_are_not_refreshed():
+    calls = []
+    manager = make_manager(calls)
+    session = make_session(-6 * 24 * 3600)
+    await manager.save(session)
+
+    assert await manager.ensure_fresh(session["access_token"]) is None
+    assert calls == []
+    # The dead session is dropped rather than kept for its full TTL
+    assert len(manager.store) == 0
+
+
+@pytest.mark.asyncio
+async def test_replaced_token_only_resolves_within_grace_window():
+    calls = []
+    manager = make_manager(calls)
+    manager.refresh_grace = 5
+    session = make_session(30)
+    await manager.save(session)
+
+    refreshed = await manager.ensure_fresh(session["access_token"])
+    assert (await manager.ensure_fresh(session["access_token"])) == refreshed
+
+    record = await manager.store.get(manager.key_for(session["access_token"]))
+    record["refreshed_at"] -= 6
+    assert await manager.ensure_fresh(session["access_token"]) is None
+    assert calls == ["r-0"]
+
+
+@pytest.mark.asyncio
+async def test_remove_ignores_forged_tokens():
+    calls = []
+    manager = make_manager(calls)
+    session = make_session(3600)
+    await manager.save(session)
+
+    # Same sub and session_id as the victim, signed with some other key
+    forged = jwt.encode(
+        {"sub": "user-1", "session_id": "s-1", "exp": int(time.time()) + 3600},
+        "attacker",
+        algorithm="HS256",
+    )
+    await manager.remove(forged)
+    assert len(manager.store) == 1
+
+    await manager.remove(session["access_token"])
+    assert len(manager.store) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code, kept", [(None, True), (503, True), (400, False)])
+async def test_failed_refresh_only_drops_rejected_sessions(monkeypatch, status_code, kept):
+    async def refresh(refresh_token: str) -> dict:
+        raise SupabaseError("refresh failed", status_code)
+
+    manager = SessionManager(InMemorySessionStore(), refresh, refresh_margin=60)
+    monkeypatch.setattr(auth, "get_session_manager", lambda: manager)
+    session = make_session(30)
+    await manager.save(session)
+
+    assert await auth.AuthService.refresh_session(session["access_token"]) is None
+    assert (len(manager.store) == 1) is kept
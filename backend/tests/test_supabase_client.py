@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.supabase_client import AsyncSupabase, SupabaseError
+
+
+def make_client(handler, **kwargs) -> AsyncSupabase:
+    return AsyncSupabase(
+        "http://supabase.test/",
+        "anon-key",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sign_in_sends_api_key_and_returns_session():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/auth/v1/token"
+        assert request.url.params["grant_type"] == "password"
+        assert request.headers["apikey"] == "anon-key"
+        return httpx.Response(200, json={"access_token": "abc", "user": {"id": "1"}})
+
+    supabase = make_client(handler)
+    session = await supabase.sign_in_with_password("test@example.com", "secret")
+    assert session["user"]["id"] == "1"
+    await supabase.aclose()
+
+
+@pytest.mark.asyncio
+async def test_user_calls_forward_the_callers_jwt():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["authorization"] == "Bearer user-jwt"
+        return httpx.Response(401, json={"msg": "invalid JWT"})
+
+    supabase = make_client(handler)
+    with pytest.raises(SupabaseError) as excinfo:
+        await supabase.get_user("user-jwt")
+    assert excinfo.value.status_code == 401
+    assert str(excinfo.value) == "invalid JWT"
+    await supabase.aclose()
+
+
+@pytest.mark.asyncio
+async def test_upstream_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=[])
+
+    supabase = make_client(handler, max_concurrency=3)
+    await asyncio.gather(*(supabase.select("health_checks", limit=1) for _ in range(10)))
+    assert peak == 3
+    await supabase.aclose()